@@ -1,24 +1,14 @@
-import asyncio
-import os
+import contextlib
+import logging
 import flet as ft
-import requests
-from bs4 import BeautifulSoup
-import threading
 
 # --- Logic Mixins ---
-try:
-    import soundcard as sc
-    import soundfile as sf
-    AUDIO_AVAILABLE = True
-except ImportError:
-    AUDIO_AVAILABLE = False
+from chordlistener import AUDIO_AVAILABLE, RECOGNITION_AVAILABLE, ChordEngine, full_name
+
+if not AUDIO_AVAILABLE:
     print("SoundCard/SoundFile not found.")
 
-try:
-    from shazamio import Shazam
-    RECOGNITION_AVAILABLE = True
-except ImportError:
-    RECOGNITION_AVAILABLE = False
+if not RECOGNITION_AVAILABLE:
     print("ShazamIO not found.")
 
 # Audio configurations
@@ -26,59 +16,6 @@ RATE = 44100
 RECORD_SECONDS = 5
 WAVE_OUTPUT_FILENAME = "captured_sample_flet.wav"
 
-async def record_audio_segment():
-    if not AUDIO_AVAILABLE:
-        return None
-    try:
-        # Run synchronous audio recording in a separate thread to prevent UI freezing
-        loop = asyncio.get_event_loop()
-        def _record():
-            mic = sc.default_speaker()
-            data = mic.record(samplerate=RATE, numframes=RATE * RECORD_SECONDS)
-            sf.write(WAVE_OUTPUT_FILENAME, data, RATE)
-            return WAVE_OUTPUT_FILENAME
-        
-        return await loop.run_in_executor(None, _record)
-    except Exception as e:
-        print(f"Error recording: {e}")
-        return None
-
-def search_cifra_club_sync(query):
-    print(f"Searching for: {query}")
-    search_url = f"https://www.google.com/search?q={query} cifra club"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    
-    try:
-        resp = requests.get(search_url, headers=headers, timeout=10)
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        
-        link = None
-        for a in soup.find_all('a', href=True):
-            if 'cifraclub.com.br' in a['href']:
-                link = a['href']
-                if '/url?q=' in link:
-                    link = link.split('/url?q=')[1].split('&')[0]
-                break
-        
-        if not link:
-            return None
-        
-        print(f"Found link: {link}")
-        cifra_resp = requests.get(link, headers=headers, timeout=10)
-        cifra_soup = BeautifulSoup(cifra_resp.text, 'html.parser')
-        
-        pre_content = cifra_soup.find('pre')
-        if pre_content:
-            return {
-                "url": link,
-                "content": pre_content.get_text()
-            }
-    except Exception as e:
-        print(f"Error scraping: {e}")
-    return None
-
 async def main(page: ft.Page):
     page.title = "Chord Listener"
     page.theme_mode = ft.ThemeMode.DARK
@@ -86,6 +23,7 @@ async def main(page: ft.Page):
     
     # State variables
     is_listening = False
+    engine = ChordEngine(WAVE_OUTPUT_FILENAME, rate=RATE, record_seconds=RECORD_SECONDS)
     
     # --- UI Components ---
     
@@ -126,9 +64,7 @@ async def main(page: ft.Page):
         status_text.color = "blue"
         page.update()
         
-        loop = asyncio.get_event_loop()
-        # Run blocking request in thread
-        result = await loop.run_in_executor(None, lambda: search_cifra_club_sync(query))
+        result = await engine.find_tabs(query)
         
         if result:
             status_text.value = "Found!"
@@ -146,49 +82,51 @@ async def main(page: ft.Page):
 
     async def listener_loop():
         nonlocal is_listening
-        shazam = Shazam() if RECOGNITION_AVAILABLE else None
-        
-        last_id = None
         
-        while is_listening:
-            if not shazam:
-                status_text.value = "Library missing: Manual search only."
-                status_text.color = "red"
-                # Stop listening
-                is_listening = False
-                btn_listen.text = "Start Auto-Listen"
-                btn_listen.icon = "mic"
-                btn_listen.disabled = True
-                page.update()
-                break
-
-            status_text.value = "Listening..."
-            status_text.color = "green"
+        if not RECOGNITION_AVAILABLE or not AUDIO_AVAILABLE:
+            status_text.value = "Library missing: Manual search only."
+            status_text.color = "red"
+            # Stop listening
+            is_listening = False
+            btn_listen.text = "Start Auto-Listen"
+            btn_listen.icon = "mic"
+            btn_listen.disabled = True
             page.update()
+            return
 
-            file_path = await record_audio_segment()
-            
-            if file_path:
-                status_text.value = "Identifying..."
+        status_text.value = "Listening..."
+        status_text.color = "green"
+        page.update()
+        
+        async with contextlib.aclosing(engine.listen()) as events:
+            async for event, data in events:
+                if event == "identifying":
+                    status_text.value = f"Identifying ({data})..."
+                    page.update()
+                    continue
+                
+                if event == "capture_failed":
+                    status_text.value = "Audio capture failed."
+                    status_text.color = "red"
+                    # Nothing is running anymore: let one click start it again
+                    is_listening = False
+                    btn_listen.text = "Start Auto-Listen"
+                    btn_listen.icon = "mic"
+                    page.update()
+                    break
+                
+                if event == "song":
+                    status_text.value = f"Detected: {full_name(data)}"
+                    page.update()
+                    await perform_search_async(full_name(data))
+                
+                status_text.value = "Listening..."
+                status_text.color = "green"
                 page.update()
-                try:
-                    out = await shazam.recognize(file_path)
-                    track = out.get('track', {})
-                    if track:
-                        key = track.get('key')
-                        if key != last_id:
-                            last_id = key
-                            title = track.get('title')
-                            subtitle = track.get('subtitle')
-                            full_name = f"{subtitle} - {title}"
-                            
-                            status_text.value = f"Detected: {full_name}"
-                            page.update()
-                            await perform_search_async(full_name)
-                except Exception as e:
-                    print(f"Shazam Error: {e}")
-            
-            await asyncio.sleep(1)
+        
+        print(f"Capture stats: {engine.capture_stats()}")
+        print(f"Stage stats: {engine.stats.summary()}")
+        print(f"Executor stats: {engine.executor_metrics()}")
 
     async def btn_listen_click(e):
         nonlocal is_listening
@@ -199,6 +137,15 @@ async def main(page: ft.Page):
         
         if is_listening:
             page.run_task(listener_loop)
+        else:
+            engine.stop()
+
+    def on_disconnect(e):
+        # Window closed: stop capturing and shut down the engine's worker pools
+        engine.stop()
+        engine.close()
+
+    page.on_disconnect = on_disconnect
 
     btn_listen = ft.ElevatedButton(
         "Start Auto-Listen",
@@ -226,4 +173,7 @@ async def main(page: ft.Page):
     )
 
 if __name__ == "__main__":
+    # Engine progress ("Searching for: ...") goes to the console like before
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("chordlistener").setLevel(logging.INFO)
     ft.app(target=main)
@@ -0,0 +1,56 @@
+"""
+Benchmark: batched Viterbi vs one viterbi_decoding call per clip.
+
+Random chroma clips (the decoder cost does not depend on content), with
+lengths jittered +-20% around the nominal length so masking is exercised.
+Paths are checked to be identical before timing.
+
+    python benchmarks/bench_batch_viterbi.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from chordlistener.chords import generate_templates, pad_chroma, viterbi_decoding, viterbi_decoding_batch  # noqa: E402
+
+FPS = 22050 / 512
+
+
+def random_clips(n_clips, n_frames, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(int(n_frames * 0.8), int(n_frames * 1.2) + 1, size=n_clips)
+    return [rng.random((12, n)).astype(np.float32) for n in lengths]
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    templates, _ = generate_templates()
+    print(f"{'clips':>6} | {'seconds':>7} | {'per-clip':>9} | {'batched':>9} | {'clips/s batched':>15} | speedup")
+    for seconds in (5, 30):
+        n_frames = int(seconds * FPS)
+        for n_clips in (1, 8, 32, 128):
+            clips = random_clips(n_clips, n_frames)
+            stack, lengths = pad_chroma(clips)
+
+            batched = viterbi_decoding_batch(stack, lengths, templates)
+            for clip, path, length in zip(clips, batched, lengths):
+                assert np.array_equal(viterbi_decoding(clip, templates), path[:length])
+
+            t_loop = best_of(lambda: [viterbi_decoding(clip, templates) for clip in clips])
+            t_batch = best_of(lambda: viterbi_decoding_batch(*pad_chroma(clips), templates))
+            print(f"{n_clips:>6} | {seconds:>6}s | {t_loop * 1e3:>7.1f}ms | {t_batch * 1e3:>7.1f}ms | {n_clips / t_batch:>15.1f} | {t_loop / t_batch:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Headless benchmark of the shared ChordEngine (no UI, no audio device).
+
+Runs the preprocess + chords stages on synthetic 30s clips, cold and then
+from a feature store, then the batched decoder, and prints the engine's
+per-stage timings.
+
+    python benchmarks/bench_engine.py
+    python benchmarks/bench_engine.py --clips 16
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from chordlistener import ChordEngine  # noqa: E402
+from chordlistener.feature_store import FeatureStore  # noqa: E402
+
+import soundfile as sf  # noqa: E402
+
+RATE = 44100
+ROOTS = [261.63, 293.66, 329.63, 349.23, 392.00, 440.00]
+
+
+def write_clip(path, rng, seconds=30):
+    t = np.arange(int(RATE * 2.5)) / RATE
+    chords = []
+    for _ in range(int(seconds / 2.5)):
+        root = ROOTS[rng.integers(len(ROOTS))]
+        third = 4 if rng.random() < 0.5 else 3
+        chords.append(sum(np.sin(2 * np.pi * root * 2 ** (k / 12) * t) for k in (0, third, 7)))
+    sf.write(path, 0.2 * np.concatenate(chords), RATE)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clips", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"clip_{i}.wav") for i in range(args.clips)]
+        for path in paths:
+            write_clip(path, rng)
+
+        engine = ChordEngine(store=FeatureStore(os.path.join(tmp, "features")))
+        engine.chords(paths[0])  # Warm-up (numba JIT, librosa caches)
+        engine.stats = type(engine.stats)()
+
+        for label in ("cold", "feature store"):
+            before = dict(engine.stats.seconds)
+            for path in paths:
+                engine.chords(path)
+            spent = {stage: engine.stats.seconds[stage] - before.get(stage, 0.0) for stage in ("preprocess", "chords")}
+            print(f"{label:>14}: " + ", ".join(f"{stage} {1000 * s / len(paths):.1f} ms/clip" for stage, s in spent.items()))
+
+        engine.chords_batch(paths)
+        print(json.dumps(engine.stats.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
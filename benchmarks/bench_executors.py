@@ -0,0 +1,105 @@
+"""
+Benchmark: explicit I/O + DSP executors vs the shared default executor.
+
+1. Throughput: chroma for N synthetic 30s clips on the dsp pool, in process
+   and thread mode, at 1..cpu_count workers.
+2. Isolation: while slow fake scrapes (time.sleep) flood the executor, how
+   long does one chord job take to come back? With run_in_executor(None, ...)
+   both share one pool; with Executors they don't.
+
+    python benchmarks/bench_executors.py
+    python benchmarks/bench_executors.py --clips 16 --scrapes 32
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from chordlistener.chords import estimate_chords  # noqa: E402
+from chordlistener.executors import Executors  # noqa: E402
+from chordlistener.preprocess import load_or_compute_chroma  # noqa: E402
+
+from bench_engine import write_clip  # noqa: E402
+
+
+def slow_scrape(seconds):
+    time.sleep(seconds)
+    return None
+
+
+def throughput(paths, mode, workers):
+    executors = Executors(dsp_workers=workers, dsp_mode=mode)
+    executors.warm_up()
+    t0 = time.perf_counter()
+    for future in [executors.dsp.submit(load_or_compute_chroma, path) for path in paths]:
+        future.result()
+    elapsed = time.perf_counter() - t0
+    metrics = executors.dsp.metrics()
+    executors.shutdown()
+    return elapsed, metrics
+
+
+async def chord_latency(path, scrapes, scrape_seconds, executors=None):
+    loop = asyncio.get_running_loop()
+    if executors is None:
+        # Old behaviour: everything on the loop's default executor
+        shared = concurrent.futures.ThreadPoolExecutor(4)
+        loop.set_default_executor(shared)
+        scrape = lambda: loop.run_in_executor(None, slow_scrape, scrape_seconds)  # noqa: E731
+        chords = lambda: loop.run_in_executor(None, estimate_chords, path)  # noqa: E731
+    else:
+        scrape = lambda: executors.io.run(slow_scrape, scrape_seconds)  # noqa: E731
+        chords = lambda: executors.dsp.run(estimate_chords, path)  # noqa: E731
+
+    pending = [asyncio.ensure_future(scrape()) for _ in range(scrapes)]
+    await asyncio.sleep(0.01)
+    t0 = time.perf_counter()
+    await chords()
+    latency = time.perf_counter() - t0
+    await asyncio.gather(*pending)
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clips", type=int, default=8)
+    parser.add_argument("--scrapes", type=int, default=16)
+    parser.add_argument("--scrape-seconds", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"clip_{i}.wav") for i in range(args.clips)]
+        for path in paths:
+            write_clip(path, rng)
+
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, max(1, cpus // 2), cpus})
+        print(f"{args.clips} x 30s clips, {cpus} CPU(s)")
+        print(f"{'mode':>8} | {'workers':>7} | {'total':>8} | {'clips/s':>7} | utilization")
+        for mode in ("process", "thread"):
+            for workers in worker_counts:
+                elapsed, metrics = throughput(paths, mode, workers)
+                print(f"{mode:>8} | {workers:>7} | {elapsed:>7.2f}s | {args.clips / elapsed:>7.2f} | {metrics['utilization']:.2f}")
+
+        print(f"\nChord job latency while {args.scrapes} x {args.scrape_seconds}s scrapes are queued:")
+        estimate_chords(paths[0])  # Warm this process for the shared-executor run
+        shared = asyncio.run(chord_latency(paths[0], args.scrapes, args.scrape_seconds))
+        executors = Executors(dsp_workers=1)
+        executors.warm_up()
+        split = asyncio.run(chord_latency(paths[0], args.scrapes, args.scrape_seconds, executors))
+        print(f"  default executor: {shared:.2f}s")
+        print(f"  io + dsp pools:   {split:.2f}s")
+        print(json.dumps(executors.metrics(), indent=2))
+        executors.shutdown()
+
+
+if __name__ == "__main__":
+    main()
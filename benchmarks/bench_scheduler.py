@@ -0,0 +1,166 @@
+"""
+Benchmark: adaptive capture scheduling vs the fixed "record 5s + sleep 1s" loop.
+
+Builds synthetic playlists (songs with distinct timbre, chord changes every
+~2s inside a song, joined by silence gaps, hard cuts or crossfades) and
+replays them block by block through AdaptiveScheduler. Recognition is
+simulated by an oracle that names the song covering most of the captured
+window (at least 3s of it), as Shazam would roughly do.
+
+Reports per transition type the detection latency (change -> trigger) and
+identification latency (change -> first result naming the new song), plus
+recognition calls made vs the fixed loop.
+
+    python benchmarks/bench_scheduler.py
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from chordlistener.capture import AdaptiveScheduler  # noqa: E402
+
+RATE = 22050
+CAPTURE_SECONDS = 5
+FIXED_PERIOD = CAPTURE_SECONDS + 1  # RECORD_SECONDS + asyncio.sleep(1)
+
+
+def colored_noise(rng, n, slope_db):
+    """White noise with a spectral slope of `slope_db` per octave."""
+    spectrum = np.fft.rfft(rng.standard_normal(n))
+    freqs = np.maximum(np.fft.rfftfreq(n, 1 / RATE), 20)
+    spectrum *= (freqs / 1000) ** (slope_db / 20 / np.log10(2))
+    y = np.fft.irfft(spectrum, n)
+    return y / (np.abs(y).max() + 1e-9)
+
+
+def synth_song(rng, seconds):
+    """A 'song': its own instrument timbre, drum colour, tempo, mix and chord progression."""
+    n = int(seconds * RATE)
+    t = np.arange(n) / RATE
+
+    # Harmonic part: chords change every 1.5-3s inside the song
+    tilt = rng.uniform(0.6, 0.95)
+    n_harmonics = rng.integers(6, 14)
+    key = rng.uniform(110, 220)
+    chords = np.zeros(n)
+    chord_len = int(rng.uniform(1.5, 3.0) * RATE)
+    for start in range(0, n, chord_len):
+        seg = slice(start, min(n, start + chord_len))
+        root = key * 2 ** (rng.choice([0, 5, 7, 9]) / 12)
+        for interval in (0, rng.choice([3, 4]), 7, 12):
+            f0 = root * 2 ** (interval / 12)
+            for h in range(1, n_harmonics + 1):
+                if f0 * h < RATE / 2:
+                    chords[seg] += tilt ** h * np.sin(2 * np.pi * f0 * h * t[seg])
+    chords /= np.abs(chords).max() + 1e-9
+
+    # Drums: song-specific noise colour, hits on the beat with exponential decay
+    beat = 60 / rng.uniform(70, 160)
+    phase = (t % beat) / beat
+    hits = np.exp(-phase * rng.uniform(8, 30))
+    drums = colored_noise(rng, n, rng.uniform(-9, 0)) * hits
+
+    mix = rng.dirichlet([2, 2])
+    y = mix[0] * chords + mix[1] * drums
+    return 0.3 * y / (np.abs(y).max() + 1e-9)
+
+
+def synth_playlist(rng, n_songs, transition):
+    """Returns audio, per-sample song id (-1 = silence) and transition times."""
+    audio, ids, changes = [], [], []
+    for song in range(n_songs):
+        y = synth_song(rng, rng.uniform(60, 200))
+        if song > 0:
+            if transition == "gap":
+                gap = np.zeros(int(rng.uniform(1.0, 3.0) * RATE))
+                audio.append(gap)
+                ids.append(np.full(gap.size, -1))
+            elif transition == "crossfade":
+                fade = int(3 * RATE)
+                ramp = np.linspace(0, 1, fade)
+                audio[-1][-fade:] *= 1 - ramp
+                y[:fade] *= ramp
+                audio[-1][-fade:] += y[:fade]
+                y = y[fade:]
+                ids[-1][-fade // 2:] = song
+            changes.append(sum(a.size for a in audio) / RATE)
+        audio.append(y)
+        ids.append(np.full(y.size, song))
+    return np.concatenate(audio), np.concatenate(ids), changes
+
+
+def oracle(ids, end):
+    """Song covering most of the capture window ending at sample `end`, or None."""
+    window = ids[max(0, end - CAPTURE_SECONDS * RATE):end]
+    window = window[window >= 0]
+    if window.size < 3 * RATE:
+        return None
+    values, counts = np.unique(window, return_counts=True)
+    return int(values[np.argmax(counts)])
+
+
+def identified_at(call_times, results, changes):
+    """For each change, seconds until the first call after it that names the new song."""
+    latencies = []
+    for song, change in enumerate(changes, start=1):
+        hits = [t for t, r in zip(call_times, results) if t >= change and r == song]
+        latencies.append(hits[0] - change if hits else np.nan)
+    return latencies
+
+
+def run_adaptive(audio, ids, changes, **scheduler_kwargs):
+    scheduler = AdaptiveScheduler(rate=RATE, capture_seconds=CAPTURE_SECONDS, **scheduler_kwargs)
+    block = int(RATE * scheduler.block_seconds)
+    call_times, results, detections = [], [], []
+    for start in range(0, audio.size - block + 1, block):
+        last_trigger = scheduler.last_trigger
+        reason = scheduler.feed(audio[start:start + block])
+        if scheduler.last_trigger != last_trigger:
+            detections.append(scheduler.now)
+        if reason is not None:
+            song = oracle(ids, start + block)
+            call_times.append(scheduler.now)
+            results.append(song)
+            scheduler.mark_recognized(song)
+
+    detect = []
+    for change in changes:
+        after = [d for d in detections if change - 1.0 <= d]
+        detect.append(after[0] - change if after else np.nan)
+    return scheduler.stats(FIXED_PERIOD), detect, identified_at(call_times, results, changes)
+
+
+def run_fixed(audio, ids, changes):
+    call_times, results = [], []
+    t = CAPTURE_SECONDS
+    while t * RATE <= audio.size:
+        call_times.append(t)
+        results.append(oracle(ids, int(t * RATE)))
+        t += FIXED_PERIOD
+    return len(call_times), identified_at(call_times, results, changes)
+
+
+def main():
+    print(f"{'transition':>10} | {'hours':>5} | {'calls fixed':>11} | {'calls adaptive':>14} | {'avoided':>7} | "
+          f"{'detect p50/p90':>14} | {'id fixed p50/p90':>16} | {'id adaptive p50/p90':>19} | missed")
+    for transition in ("gap", "cut", "crossfade"):
+        rng = np.random.default_rng(42)
+        audio, ids, changes = synth_playlist(rng, 12, transition)
+        stats, detect, id_adaptive = run_adaptive(audio, ids, changes)
+        fixed_calls, id_fixed = run_fixed(audio, ids, changes)
+
+        def pct(values):
+            values = np.asarray(values, dtype=float)
+            values = values[np.isfinite(values)]
+            return f"{np.percentile(values, 50):5.1f}/{np.percentile(values, 90):5.1f}s" if values.size else "n/a"
+
+        print(f"{transition:>10} | {audio.size / RATE / 3600:5.2f} | {fixed_calls:>11} | {stats['recognitions']:>14} | "
+              f"{fixed_calls - stats['recognitions']:>7} | {pct(detect):>14} | {pct(id_fixed):>16} | "
+              f"{pct(id_adaptive):>19} | {int(np.isnan(id_adaptive).sum())}")
+        print(f"{'':>10}   triggers: {stats['triggers']}")
+
+
+if __name__ == "__main__":
+    main()
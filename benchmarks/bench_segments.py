@@ -0,0 +1,67 @@
+"""
+Micro-benchmark: chord path -> segments -> "C:1.50|..." string / JSONL.
+
+Compares the original per-frame Python loop against the numpy
+run-length encoding in chordlistener/chords.py at 1k, 100k and 1M frames.
+
+    python benchmarks/bench_segments.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from chordlistener.chords import generate_templates, segment_chords, format_chords, chords_to_jsonl  # noqa: E402
+
+FPS = 22050 / 512
+
+
+def legacy_group(chord_indices, labels, fps):
+    """The loop estimate_chords used before the numpy version (kept for comparison)."""
+    grouped_chords = []
+    current_idx = chord_indices[0]
+    current_count = 1
+    for idx in chord_indices[1:]:
+        if idx == current_idx:
+            current_count += 1
+        else:
+            duration = current_count / fps
+            if duration > 0.1:
+                grouped_chords.append(f"{labels[current_idx]}:{duration:.2f}")
+            current_idx = idx
+            current_count = 1
+    duration = current_count / fps
+    if duration > 0.1:
+        grouped_chords.append(f"{labels[current_idx]}:{duration:.2f}")
+    return "|".join(grouped_chords)
+
+
+def synthetic_path(n_frames, seed=0):
+    """Random chord path with run lengths of roughly 0.05s - 3s."""
+    rng = np.random.default_rng(seed)
+    runs = rng.integers(2, 130, size=n_frames // 2 + 1)
+    ids = rng.integers(0, 24, size=runs.size)
+    return np.repeat(ids, runs)[:n_frames]
+
+
+def main():
+    _, labels = generate_templates()
+    print(f"{'frames':>10} | {'legacy loop':>12} | {'numpy str':>10} | {'numpy jsonl':>11} | speedup")
+    for n_frames in (1_000, 100_000, 1_000_000):
+        path = synthetic_path(n_frames)
+        as_list = path.tolist()  # Legacy code received a Python list
+
+        assert legacy_group(as_list, labels, FPS) == format_chords(*segment_chords(path, FPS), labels, FPS)
+
+        number = max(1, 100_000 // n_frames)
+        t_legacy = timeit.timeit(lambda: legacy_group(as_list, labels, FPS), number=number) / number
+        t_str = timeit.timeit(lambda: format_chords(*segment_chords(path, FPS), labels, FPS), number=number) / number
+        t_jsonl = timeit.timeit(lambda: chords_to_jsonl(*segment_chords(path, FPS), labels, FPS), number=number) / number
+
+        print(f"{n_frames:>10} | {t_legacy * 1e3:>10.2f}ms | {t_str * 1e3:>8.2f}ms | {t_jsonl * 1e3:>9.2f}ms | {t_legacy / t_str:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: peak memory and speed of the block-streaming chord analysis.
+
+Writes synthetic chord-progression WAVs (written block by block, so the
+generator itself stays small), runs iter_chord_segments over each and
+reports the tracemalloc peak. The peak should stay flat as the file grows.
+
+    python benchmarks/bench_streaming.py                 # 0.1, 1 and 2 hours
+    python benchmarks/bench_streaming.py --hours 0.05 0.2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from chordlistener.chords import iter_chord_segments  # noqa: E402
+
+import soundfile as sf  # noqa: E402
+
+RATE = 44100
+ROOTS = [261.63, 293.66, 329.63, 349.23, 392.00, 440.00, 493.88]
+
+
+def write_synthetic(path, hours, chord_seconds=2.5, seed=0):
+    """Random major/minor triads, one every `chord_seconds`, mono 16-bit PCM."""
+    rng = np.random.default_rng(seed)
+    n_chords = int(hours * 3600 / chord_seconds)
+    t = np.arange(int(RATE * chord_seconds)) / RATE
+    with sf.SoundFile(path, "w", samplerate=RATE, channels=1, subtype="PCM_16") as f:
+        for _ in range(n_chords):
+            root = ROOTS[rng.integers(len(ROOTS))]
+            third = 4 if rng.random() < 0.5 else 3
+            y = sum(np.sin(2 * np.pi * root * 2 ** (k / 12) * t) for k in (0, third, 7))
+            f.write((0.2 * y).astype(np.float32))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=float, nargs="+", default=[0.1, 1.0, 2.0])
+    args = parser.parse_args()
+
+    print(f"{'hours':>6} | {'file MB':>8} | {'peak MB':>8} | {'segments':>8} | {'time':>8} | x realtime")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Warm-up: numba JIT / librosa caches would otherwise inflate the first row
+        warmup = os.path.join(tmp, "warmup.wav")
+        write_synthetic(warmup, 30 / 3600)
+        for _ in iter_chord_segments(warmup):
+            pass
+
+        for hours in args.hours:
+            path = os.path.join(tmp, f"synthetic_{hours}h.wav")
+            write_synthetic(path, hours)
+
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            n_segments = sum(segments[0].size for segments in iter_chord_segments(path))
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            size_mb = os.path.getsize(path) / 2**20
+            print(f"{hours:>6.2f} | {size_mb:>8.1f} | {peak / 2**20:>8.1f} | {n_segments:>8} | {elapsed:>7.1f}s | {hours * 3600 / elapsed:>6.1f}x")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+from .capture import AUDIO_AVAILABLE
+from .engine import ChordEngine
+from .identify import RECOGNITION_AVAILABLE, full_name
+
+__all__ = ["AUDIO_AVAILABLE", "RECOGNITION_AVAILABLE", "ChordEngine", "full_name"]
@@ -0,0 +1,259 @@
+import asyncio
+import collections
+import logging
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+try:
+    import soundcard as sc
+    import soundfile as sf
+    AUDIO_AVAILABLE = True
+except ImportError:
+    AUDIO_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+# --- Adaptive capture scheduling ---
+# Instead of "record 5s, recognize, sleep 1s" forever, audio is monitored
+# continuously in short blocks. A cheap loudness + spectral-novelty signal
+# triggers recognition right after a song change (silence gap or novelty
+# peak); during a steady song only confirmation checks run, backing off
+# from base_interval up to max_interval. Nothing new is due until the last
+# result was reported with mark_recognized; triggers seen meanwhile wait.
+
+class AdaptiveScheduler:
+    def __init__(self, rate=44100, block_seconds=0.25, capture_seconds=5, settle_seconds=3.0,
+                 silence_db=-50.0, min_silence=0.75, novelty_db=2.0, novelty_lag=1.5,
+                 base_interval=15.0, max_interval=60.0, refractory=15.0):
+        self.rate = rate
+        self.block_seconds = block_seconds
+        self.capture_seconds = capture_seconds
+        self.settle_seconds = settle_seconds # Audio needed after a change before it is worth capturing
+        self.silence_db = silence_db
+        self.min_silence = min_silence
+        self.novelty_db = novelty_db
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.novelty_lag = novelty_lag
+        self.refractory = refractory
+
+        # 16 log-spaced bands, 60 Hz .. 11 kHz
+        n = int(rate * block_seconds)
+        freqs = np.fft.rfftfreq(n, 1 / rate)
+        edges = np.geomspace(60, min(11000, rate / 2), 17)
+        self._band_starts = np.searchsorted(freqs, edges[:-1])
+        self._window = np.hanning(n)
+        # Short (~2s) and long (~20s) memory of the band spectrum
+        self._fast = 1 - np.exp(-block_seconds / 2.0)
+        self._slow = 1 - np.exp(-block_seconds / 20.0)
+
+        self.now = 0.0
+        self.short_bands = None
+        self.long_bands = None
+        self.novelty = 0.0
+        self.loudness_db = -120.0
+        self.silent_for = 0.0
+        self.sound_for = 0.0
+        self.in_gap = False
+        self.last_trigger = -np.inf
+        self.pending = ("start", 0.0) # (reason, audio needed after this time)
+        self.last_reason = None
+        self.retry_after_trigger = False
+        self.interval = base_interval
+        self.next_confirm = np.inf
+        self.song_key = None
+        self.busy = False # A recognition is out; set by _due, cleared by mark_recognized
+
+        self.recognitions = 0
+        self.triggers = collections.Counter()
+
+    def _features(self, block):
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        rms = np.sqrt(np.mean(block ** 2))
+        power = np.abs(np.fft.rfft(block * self._window[:block.size], n=self._window.size)) ** 2
+        return 20 * np.log10(rms + 1e-10), np.add.reduceat(power, self._band_starts)
+
+    @staticmethod
+    def _shape_db(bands):
+        # Floor at -30 dB of the total so near-empty bands don't dominate, then remove overall gain
+        shape = 10 * np.log10(bands + 1e-3 * bands.sum() + 1e-12)
+        return shape - shape.mean()
+
+    def feed(self, block):
+        """Analyse one block of audio. Returns the reason recognition is due now, or None."""
+        self.now += block.shape[0] / self.rate
+        self.loudness_db, bands = self._features(block)
+
+        if self.loudness_db < self.silence_db:
+            self.silent_for += self.block_seconds
+            self.sound_for = 0.0
+            if self.silent_for >= self.min_silence:
+                self.in_gap = True
+            return None
+
+        self.silent_for = 0.0
+        self.sound_for += self.block_seconds
+        if self.in_gap:
+            # Sound is back after a gap: new song, capture it once it has settled
+            self.in_gap = False
+            self._trigger("silence_gap", self.now - self.block_seconds)
+            self.short_bands = self.long_bands = None
+
+        # Spectral novelty: short vs long term band energies (averaged as power), compared in dB
+        if self.short_bands is None:
+            self.short_bands = bands.copy()
+            self.long_bands = bands.copy()
+        else:
+            self.short_bands += self._fast * (bands - self.short_bands)
+            self.long_bands += self._slow * (bands - self.long_bands)
+        self.novelty = float(np.mean(np.abs(self._shape_db(self.short_bands) - self._shape_db(self.long_bands))))
+
+        if self.novelty > self.novelty_db and self.now - self.last_trigger > self.refractory and self.pending is None:
+            # The novelty peak lags the change by about novelty_lag seconds
+            self._trigger("novelty", self.now - self.novelty_lag)
+            # Forget the old song so the new one does not keep triggering
+            self.long_bands = self.short_bands.copy()
+
+        if self.pending is not None:
+            reason, after = self.pending
+            if not self.busy and self.now - after >= self.settle_seconds and self.sound_for >= self.settle_seconds:
+                self.pending = None
+                return self._due(reason)
+            return None
+
+        if self.now >= self.next_confirm:
+            return self._due("confirm")
+        return None
+
+    def _trigger(self, reason, at):
+        self.last_trigger = at
+        self.pending = (reason, at)
+
+    def _due(self, reason):
+        self.recognitions += 1
+        self.triggers[reason] += 1
+        self.last_reason = reason
+        # Until a result comes back, don't schedule another confirm
+        self.next_confirm = np.inf
+        self.busy = True
+        return reason
+
+    def mark_recognized(self, song_key):
+        """Report the recognition result (None when nothing matched) to pick the next check."""
+        self.busy = False
+        if song_key is None:
+            self.interval = self.base_interval
+        elif song_key != self.song_key:
+            self.song_key = song_key
+            self.interval = self.base_interval
+        elif self.last_reason in ("novelty", "silence_gap") and not self.retry_after_trigger:
+            # A change was detected but the window may still hold the old song: look again soon
+            self.retry_after_trigger = True
+            self.next_confirm = self.now + self.capture_seconds
+            return
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        self.retry_after_trigger = False
+        self.next_confirm = self.now + self.interval
+
+    def stats(self, fixed_period=6.0):
+        """Recognition calls made vs a fixed loop running one every `fixed_period` seconds."""
+        fixed_calls = int(self.now // fixed_period)
+        return {
+            "seconds": round(self.now, 1),
+            "recognitions": self.recognitions,
+            "triggers": dict(self.triggers),
+            "fixed_loop_calls": fixed_calls,
+            "calls_avoided": max(0, fixed_calls - self.recognitions),
+        }
+
+class LoopbackMonitor:
+    """
+    Captures system audio on a background thread, feeds AdaptiveScheduler and
+    hands a WAV of the last `capture_seconds` to the asyncio side when due.
+    Each capture gets its own file next to `output_path` (<name>_XXXX.wav), so
+    a clip is never rewritten while it is being recognised. At most one capture
+    is outstanding: the next one waits for mark_recognized.
+    """
+    def __init__(self, output_path, rate=44100, capture_seconds=5, **scheduler_kwargs):
+        self.output_path = output_path
+        self.rate = rate
+        self.scheduler = AdaptiveScheduler(rate=rate, capture_seconds=capture_seconds, **scheduler_kwargs)
+        self.block_frames = int(rate * self.scheduler.block_seconds)
+        self._ring = collections.deque(maxlen=int(np.ceil(capture_seconds / self.scheduler.block_seconds)))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._loop = None
+        self._queue = None
+        self._last_capture = None
+
+    def start(self, loop):
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    async def next_capture(self):
+        """Wait until recognition is due. Returns (reason, wav path), or (None, None) if capture failed."""
+        return await self._queue.get()
+
+    def mark_recognized(self, song_key):
+        with self._lock:
+            self.scheduler.mark_recognized(song_key)
+
+    def remove_captures(self):
+        """Delete the last capture file (call once nothing reads it anymore)."""
+        if self._last_capture is not None and os.path.exists(self._last_capture):
+            os.remove(self._last_capture)
+        self._last_capture = None
+
+    def stats(self):
+        with self._lock:
+            return self.scheduler.stats()
+
+    def _run(self):
+        try:
+            speaker = sc.default_speaker()
+            mic = sc.get_microphone(id=str(speaker.name), include_loopback=True)
+            with mic.recorder(samplerate=self.rate) as recorder:
+                while not self._stop.is_set():
+                    block = recorder.record(numframes=self.block_frames)
+                    self._ring.append(block)
+                    with self._lock:
+                        reason = self.scheduler.feed(block)
+                    if reason is not None:
+                        self._loop.call_soon_threadsafe(self._emit, (reason, self._write_capture()))
+        except Exception as e:
+            log.warning("Error recording: %s", e)
+            self._loop.call_soon_threadsafe(self._emit, (None, None))
+
+    def _write_capture(self):
+        root, ext = os.path.splitext(os.path.abspath(self.output_path))
+        fd, path = tempfile.mkstemp(prefix=os.path.basename(root) + "_", suffix=ext, dir=os.path.dirname(root))
+        os.close(fd)
+        try:
+            sf.write(path, np.concatenate(self._ring), self.rate)
+        except Exception:
+            os.remove(path)
+            raise
+        # The previous clip was already reported via mark_recognized (the scheduler waits for it)
+        self.remove_captures()
+        self._last_capture = path
+        return path
+
+    def _emit(self, item):
+        # Runs on the event loop: only the newest item is kept, stale ones are dropped
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(item)
@@ -0,0 +1,428 @@
+import json
+
+import numpy as np
+
+from .preprocess import load_or_compute_chroma, stream_chroma
+
+# --- Improved Chord Recognition with Viterbi Decoding ---
+
+def generate_templates():
+    """
+    Generate 12-dimensional chord templates for Major and Minor triads.
+    Returns:
+        templates (np.ndarray): Shape (24, 12). Rows are chords, columns are chroma bins.
+        labels (list): List of chord names correspoddning to rows.
+    """
+    templates = []
+    labels = []
+    
+    # 12 Semitones
+    semitones = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+    
+    # Major (Root, Major 3rd, Perfect 5th) -> Intervals: 0, 4, 7
+    # Minor (Root, Minor 3rd, Perfect 5th) -> Intervals: 0, 3, 7
+    
+    for root_idx, name in enumerate(semitones):
+        # Major
+        vec_maj = np.zeros(12)
+        vec_maj[root_idx] = 1.0
+        vec_maj[(root_idx + 4) % 12] = 1.0 # Give slightly less weight to 3rd/5th if we wanted, but binary is fine for CENS
+        vec_maj[(root_idx + 7) % 12] = 1.0
+        templates.append(vec_maj)
+        labels.append(name)
+        
+        # Minor
+        vec_min = np.zeros(12)
+        vec_min[root_idx] = 1.0
+        vec_min[(root_idx + 3) % 12] = 1.0
+        vec_min[(root_idx + 7) % 12] = 1.0
+        templates.append(vec_min)
+        labels.append(name + 'm')
+        
+    return np.array(templates), labels
+
+def log_emission(chroma, templates):
+    """
+    Log emission probabilities (cosine similarity of chroma to each template).
+    chroma: (12, N), or a (batch, 12, N) stack
+    Returns:
+        log_emit (np.ndarray): Shape (n_chords, n_frames) or (batch, n_chords, n_frames).
+    """
+    # Norm templates
+    templates_norm = np.linalg.norm(templates, axis=1, keepdims=True)
+    templates_unit = templates / (templates_norm + 1e-6)
+    
+    # Norm chroma
+    chroma_norm = np.linalg.norm(chroma, axis=-2, keepdims=True)
+    chroma_unit = chroma / (chroma_norm + 1e-6)
+    
+    # Similarity matrix (n_chords, n_frames)
+    # Value is between 0 and 1
+    emission = np.matmul(templates_unit, chroma_unit)
+    
+    # Log probabilities to avoid underflow
+    return np.log(emission + 1e-6)
+
+def log_transitions(n_chords, transition_prob=0.95):
+    """
+    Log transition matrix: high probability to stay in the same chord, lower to switch.
+    This acts as a smoothing factor naturally.
+    """
+    trans_mat = np.ones((n_chords, n_chords)) * ((1 - transition_prob) / (n_chords - 1))
+    np.fill_diagonal(trans_mat, transition_prob)
+    return np.log(trans_mat)
+
+def viterbi_decoding(chroma, templates, transition_prob=0.95):
+    """
+    Find most likely chord sequence using Viterbi algorithm.
+    chroma: (12, N)
+    templates: (24, 12)
+    """
+    n_frames = chroma.shape[1]
+    n_chords = templates.shape[0]
+    
+    # 1. Emission Probabilities (Cosine Similarity)
+    log_emit = log_emission(chroma, templates)
+    
+    # 2. Transition Matrix
+    log_trans = log_transitions(n_chords, transition_prob)
+    
+    # 3. Viterbi Path finding
+    path = np.zeros((n_chords, n_frames), dtype=int)
+    log_delta = np.zeros((n_chords, n_frames))
+    
+    # Init
+    log_delta[:, 0] = log_emit[:, 0]
+    
+    for t in range(1, n_frames):
+        # For each current state (chord), find best previous state
+        # Broadcast add: (n_chords, 1) + (n_chords, n_chords) -> (n_chords, n_chords)
+        # We want max over previous states (columns of trans_mat)
+        # delta[t-1] is shape (n_chords,)
+        
+        # scores[i, j] = prob of going from state i to j
+        scores = log_delta[:, t-1][:, None] + log_trans
+        
+        # max over previous states (axis 0)
+        best_prev = np.argmax(scores, axis=0)
+        
+        path[:, t] = best_prev
+        
+        # Current max probability + emission
+        log_delta[:, t] = scores[best_prev, np.arange(n_chords)] + log_emit[:, t]
+        
+    # Backtrack (filled in place, no list append + reverse)
+    best_path = np.empty(n_frames, dtype=int)
+    best_path[-1] = np.argmax(log_delta[:, -1])
+    
+    for t in range(n_frames - 1, 0, -1):
+        best_path[t - 1] = path[best_path[t], t]
+        
+    return best_path
+
+def pad_chroma(chromas):
+    """
+    Stack chroma sequences of unequal length for viterbi_decoding_batch.
+    Returns:
+        stack (np.ndarray): Shape (batch, 12, max_frames), zero padded.
+        lengths (np.ndarray): Valid frames per clip.
+    """
+    lengths = np.array([c.shape[1] for c in chromas], dtype=int)
+    stack = np.zeros((len(chromas), 12, lengths.max(initial=0)), dtype=np.float32)
+    for i, chroma in enumerate(chromas):
+        stack[i, :, :lengths[i]] = chroma
+    return stack, lengths
+
+def viterbi_decoding_batch(chroma_stack, lengths, templates, transition_prob=0.95):
+    """
+    Viterbi over a padded batch of clips in one pass: the time loop is shared
+    and each step is a single (batch, n_chords, n_chords) operation.
+    Clips shorter than the stack are masked: their scores freeze after their
+    last frame and backtracking starts from there.
+    chroma_stack: (batch, 12, T)
+    lengths: (batch,)
+    Returns:
+        paths (np.ndarray): Shape (batch, T); frames past a clip's length are -1.
+    """
+    n_clips, _, n_frames = chroma_stack.shape
+    n_chords = templates.shape[0]
+    lengths = np.asarray(lengths)
+    
+    log_emit = log_emission(chroma_stack, templates) # (batch, n_chords, T)
+    log_trans = log_transitions(n_chords, transition_prob)
+    
+    # Back-pointers in the smallest dtype that fits a state index
+    pointers = np.zeros((n_clips, n_chords, n_frames), dtype=np.min_scalar_type(n_chords))
+    paths = np.empty((n_clips, n_frames), dtype=int)
+    if n_frames == 0:
+        return paths
+    
+    log_delta = log_emit[:, :, 0]
+    
+    for t in range(1, n_frames):
+        # scores[b, i, j] = score of clip b going from state i to j
+        scores = log_delta[:, :, None] + log_trans
+        best_prev = np.argmax(scores, axis=1)
+        pointers[:, :, t] = best_prev
+        
+        step = scores.max(axis=1) + log_emit[:, :, t]
+        
+        # Clips that already ended keep their final scores
+        if t < lengths.min():
+            log_delta = step
+        else:
+            log_delta = np.where((t < lengths)[:, None], step, log_delta)
+        
+    # Backtrack all clips together; each one starts at its own last frame
+    clips = np.arange(n_clips)
+    last_best = np.argmax(log_delta, axis=1)
+    ends = {}
+    for i, length in enumerate(lengths):
+        ends.setdefault(length - 1, []).append(i)
+        
+    state = np.zeros(n_clips, dtype=np.intp)
+    for t in range(n_frames - 1, -1, -1):
+        if t in ends:
+            state[ends[t]] = last_best[ends[t]]
+        paths[:, t] = state
+        if t > 0:
+            state = pointers[clips, state, t]
+            
+    paths[np.arange(n_frames) >= lengths[:, None]] = -1
+    return paths
+
+class WindowedViterbi:
+    """
+    Viterbi decoder fed one chroma block at a time.
+    The forward scores are carried across blocks, but back-pointers are only
+    kept for the last `lag` frames: older frames are committed by backtracking
+    from the current best state. Memory is bounded regardless of input length.
+    """
+    def __init__(self, templates, transition_prob=0.95, lag=430):
+        self.templates = templates
+        self.n_chords = templates.shape[0]
+        self.log_trans = log_transitions(self.n_chords, transition_prob)
+        self.lag = lag # ~10s at 43 fps
+        self.log_delta = None
+        self.pointers = np.zeros((self.n_chords, 0), dtype=int)
+        
+    def push(self, chroma):
+        """Decode a (12, n) block; returns the path of frames that are now committed."""
+        log_emit = log_emission(chroma, self.templates)
+        n_frames = log_emit.shape[1]
+        if n_frames == 0:
+            return np.zeros(0, dtype=int)
+        
+        pointers = np.zeros((self.n_chords, n_frames), dtype=int)
+        start = 0
+        if self.log_delta is None:
+            self.log_delta = log_emit[:, 0]
+            start = 1
+            
+        states = np.arange(self.n_chords)
+        for t in range(start, n_frames):
+            scores = self.log_delta[:, None] + self.log_trans
+            best_prev = np.argmax(scores, axis=0)
+            pointers[:, t] = best_prev
+            self.log_delta = scores[best_prev, states] + log_emit[:, t]
+            
+        # Keep scores near zero so hour-long inputs don't lose precision
+        self.log_delta = self.log_delta - self.log_delta.max()
+        
+        self.pointers = np.concatenate((self.pointers, pointers), axis=1)
+        return self._commit(self.pointers.shape[1] - self.lag)
+    
+    def flush(self):
+        """Commit every pending frame (end of input)."""
+        return self._commit(self.pointers.shape[1])
+    
+    def _commit(self, n_commit):
+        if n_commit <= 0:
+            return np.zeros(0, dtype=int)
+        
+        n_pending = self.pointers.shape[1]
+        best_path = np.empty(n_pending, dtype=int)
+        best_path[-1] = np.argmax(self.log_delta)
+        for t in range(n_pending - 1, 0, -1):
+            best_path[t - 1] = self.pointers[best_path[t], t]
+        
+        # Column 0 of the remaining window points into committed frames and is never followed
+        self.pointers = self.pointers[:, n_commit:]
+        return best_path[:n_commit]
+
+def run_lengths(chord_indices):
+    """
+    Run-length encode a frame-level chord path with array operations.
+    Returns:
+        start_frames (np.ndarray): First frame of each run.
+        end_frames (np.ndarray): One past the last frame of each run.
+        chord_ids (np.ndarray): Template row of each run.
+    """
+    chord_indices = np.asarray(chord_indices)
+    if chord_indices.size == 0:
+        empty = np.zeros(0, dtype=int)
+        return empty, empty, empty
+    
+    # Change points: frames where the label differs from the previous one
+    change = np.flatnonzero(np.diff(chord_indices)) + 1
+    start_frames = np.concatenate(([0], change))
+    end_frames = np.concatenate((change, [chord_indices.size]))
+    return start_frames, end_frames, chord_indices[start_frames]
+
+def drop_short(start_frames, end_frames, chord_ids, fps, min_duration=0.1):
+    """Drop blips shorter than min_duration seconds (Viterbi already smoothed most)."""
+    keep = (end_frames - start_frames) / fps > min_duration
+    return start_frames[keep], end_frames[keep], chord_ids[keep]
+
+def segment_chords(chord_indices, fps, min_duration=0.1):
+    """Group a frame-level chord path into (start_frames, end_frames, chord_ids) segments."""
+    return drop_short(*run_lengths(chord_indices), fps, min_duration)
+
+def format_chords(start_frames, end_frames, chord_ids, labels, fps):
+    """Build the "C:1.50|G:2.00|Am:0.50" string consumed by the C# front end."""
+    durations = ((end_frames - start_frames) / fps).tolist()
+    names = np.asarray(labels)[chord_ids].tolist()
+    return "|".join(map("{}:{:.2f}".format, names, durations))
+
+def chords_to_jsonl(start_frames, end_frames, chord_ids, labels, fps):
+    """Serialize segments as one JSON object per line: {"start", "end", "chord"}."""
+    starts = np.round(start_frames / fps, 3).tolist()
+    ends = np.round(end_frames / fps, 3).tolist()
+    names = np.asarray(labels)[chord_ids].tolist()
+    return "\n".join(
+        json.dumps({"start": s, "end": e, "chord": c})
+        for s, e, c in zip(starts, ends, names)
+    )
+
+def decode_chords(chroma, as_jsonl=False, transition_prob=0.95, min_duration=0.1):
+    """Chroma -> "C:1.5|G:2.0|Am:0.5" (or JSONL) without touching the audio."""
+    # Generate Templates (Major + Minor)
+    templates, labels = generate_templates()
+    
+    # Decode optimal path
+    chord_indices = viterbi_decoding(chroma, templates, transition_prob)
+    
+    # Post-Processing: Group by chord and calculate duration
+    # FPS = 22050 / 512 ~= 43.066
+    fps = 22050 / 512
+    segments = segment_chords(chord_indices, fps, min_duration)
+    
+    if as_jsonl:
+        return chords_to_jsonl(*segments, labels, fps)
+
+    # Return structured format: "C:1.5|G:2.0|Am:0.5"
+    return format_chords(*segments, labels, fps)
+
+def estimate_chords(file_path, as_jsonl=False, store=None, transition_prob=0.95, min_duration=0.1):
+    try:
+        chroma = load_or_compute_chroma(file_path, store)
+        return decode_chords(chroma, as_jsonl, transition_prob, min_duration)
+        
+    except Exception as e:
+        return f"Chord Error: {str(e)}"
+
+def estimate_chords_batch(file_paths, store=None, transition_prob=0.95, min_duration=0.1, batch_size=64, executor=None):
+    """
+    estimate_chords for many files, decoded with viterbi_decoding_batch.
+    Chroma is computed on `executor` when given (one file per task), so the
+    DSP spreads over its workers. Clips are sorted by length before batching
+    so padding stays small.
+    Returns one result string per file, in input order.
+    """
+    templates, labels = generate_templates()
+    fps = 22050 / 512
+    
+    results = [None] * len(file_paths)
+    if executor is not None:
+        pending = [executor.submit(load_or_compute_chroma, file_path, store) for file_path in file_paths]
+    else:
+        pending = [None] * len(file_paths)
+        
+    chromas = {}
+    for i, file_path in enumerate(file_paths):
+        try:
+            if pending[i] is not None:
+                chromas[i] = pending[i].result()
+            else:
+                chromas[i] = load_or_compute_chroma(file_path, store)
+        except Exception as e:
+            results[i] = f"Chord Error: {str(e)}"
+    
+    order = sorted(chromas, key=lambda i: chromas[i].shape[1])
+    for b in range(0, len(order), batch_size):
+        batch = order[b:b + batch_size]
+        stack, lengths = pad_chroma([chromas[i] for i in batch])
+        paths = viterbi_decoding_batch(stack, lengths, templates, transition_prob)
+        for i, path, length in zip(batch, paths, lengths):
+            segments = segment_chords(path[:length], fps, min_duration)
+            results[i] = format_chords(*segments, labels, fps)
+            
+    return results
+
+# --- Streaming analysis for long files (bounded memory) ---
+
+def iter_chord_segments(file_path, min_duration=0.1, sr=22050, hop_length=512, lag=430, **stream_kwargs):
+    """
+    Streaming counterpart of estimate_chords.
+    Yields (start_frames, end_frames, chord_ids) arrays as segments become final.
+    The run still open at the end of each committed chunk is carried over, so a
+    chord spanning block boundaries comes out as one segment.
+    """
+    templates, _ = generate_templates()
+    decoder = WindowedViterbi(templates, lag=lag)
+    fps = sr / hop_length
+    
+    def committed_paths():
+        for chroma in stream_chroma(file_path, sr=sr, hop_length=hop_length, **stream_kwargs):
+            yield decoder.push(chroma)
+        yield decoder.flush()
+    
+    offset = 0
+    open_start, open_id = None, None
+    for path in committed_paths():
+        if path.size == 0:
+            continue
+        
+        start_frames, end_frames, chord_ids = run_lengths(path)
+        start_frames = start_frames + offset
+        end_frames = end_frames + offset
+        
+        # Extend the carried run if this chunk starts with the same chord, else close it
+        if open_id is not None:
+            if chord_ids[0] == open_id:
+                start_frames[0] = open_start
+            else:
+                start_frames = np.concatenate(([open_start], start_frames))
+                end_frames = np.concatenate(([offset], end_frames))
+                chord_ids = np.concatenate(([open_id], chord_ids))
+        offset += path.size
+        
+        # The last run may continue in the next chunk
+        open_start, open_id = start_frames[-1], chord_ids[-1]
+        yield drop_short(start_frames[:-1], end_frames[:-1], chord_ids[:-1], fps, min_duration)
+    
+    if open_id is not None:
+        yield drop_short(np.array([open_start]), np.array([offset]), np.array([open_id]), fps, min_duration)
+
+def iter_chords_jsonl(file_path):
+    """
+    Whole-file chord estimation as JSONL, with constant memory (see stream_chroma).
+    Yields blocks of lines ({"start", "end", "chord"} per segment) as segments
+    become final; nothing proportional to file length is held.
+    """
+    _, labels = generate_templates()
+    fps = 22050 / 512
+    for segments in iter_chord_segments(file_path):
+        if segments[0].size:
+            yield chords_to_jsonl(*segments, labels, fps)
+
+def estimate_chords_streaming(file_path):
+    """Whole-file chord estimation with constant memory (see stream_chroma)."""
+    try:
+        _, labels = generate_templates()
+        fps = 22050 / 512
+        parts = [format_chords(*segments, labels, fps) for segments in iter_chord_segments(file_path)]
+        return "|".join(p for p in parts if p)
+        
+    except Exception as e:
+        return f"Chord Error: {str(e)}"
@@ -0,0 +1,183 @@
+import asyncio
+import collections
+import contextlib
+import logging
+import threading
+import time
+
+from .capture import LoopbackMonitor
+from .executors import Executors
+from .identify import Identifier
+
+log = logging.getLogger(__name__)
+
+# --- Engine: capture -> preprocess -> identify -> chords -> tabs ---
+
+class StageStats:
+    """Call count and wall time per pipeline stage."""
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.seconds = collections.defaultdict(float)
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.calls[stage] += 1
+            self.seconds[stage] += time.perf_counter() - start
+
+    def summary(self):
+        return {
+            stage: {
+                "calls": calls,
+                "seconds": round(self.seconds[stage], 3),
+                "avg_ms": round(1000 * self.seconds[stage] / calls, 1),
+            }
+            for stage, calls in self.calls.items()
+        }
+
+class ChordEngine:
+    """
+    The pipeline shared by app.py, cli_app.py and recognizer.py. One instance
+    owns the Shazam client, the scraper session + cache, the feature store and
+    the stage timings; front ends only render what it returns.
+    Scraping runs on executors.io, and chords_batch spreads chroma over
+    executors.dsp (see executors.py). chords() and chords_streaming() run on
+    the caller's thread: async callers should hand them to executors.dsp.
+    """
+    def __init__(self, capture_path="captured_sample.wav", rate=44100, record_seconds=5, store=None, executors=None):
+        self.capture_path = capture_path
+        self.rate = rate
+        self.record_seconds = record_seconds
+        self.store = store
+        self.executors = executors or Executors()
+        self.identifier = Identifier()
+        self._scraper = None
+        self.stats = StageStats()
+        self.monitor = None # Monitor of the most recent listen(), for capture_stats()
+        self._stop_listening = None
+
+    # --- Stages ---
+
+    async def identify(self, file_path):
+        """Shazam track dict for a clip, or None."""
+        with self.stats.measure("identify"):
+            return await self.identifier.recognize(file_path)
+
+    @property
+    def scraper(self):
+        # requests/bs4 are only needed by the front ends that show tabs
+        if self._scraper is None:
+            from .tabs import CifraClubScraper
+            self._scraper = CifraClubScraper()
+        return self._scraper
+
+    async def find_tabs(self, query):
+        """{"url", "content"} for "Artist - Song", or None."""
+        with self.stats.measure("tabs"):
+            return await self.executors.io.run(self.scraper.search, query)
+
+    def chords(self, file_path, as_jsonl=False, **decode_kwargs):
+        """Chord string for a clip (same format as estimate_chords)."""
+        # librosa is only needed from here on
+        from .chords import decode_chords
+        from .preprocess import load_or_compute_chroma
+        try:
+            with self.stats.measure("preprocess"):
+                chroma = load_or_compute_chroma(file_path, self.store)
+            with self.stats.measure("chords"):
+                return decode_chords(chroma, as_jsonl, **decode_kwargs)
+        except Exception as e:
+            return f"Chord Error: {str(e)}"
+
+    def chords_batch(self, file_paths, **decode_kwargs):
+        from .chords import estimate_chords_batch
+        # A single clip isn't worth shipping to a worker process
+        executor = self.executors.dsp if len(file_paths) > 1 else None
+        with self.stats.measure("chords_batch"):
+            return estimate_chords_batch(file_paths, store=self.store, executor=executor, **decode_kwargs)
+
+    def chords_streaming(self, file_path):
+        """Chord string for a whole file of any length (bounded memory)."""
+        from .chords import estimate_chords_streaming
+        with self.stats.measure("chords_streaming"):
+            return estimate_chords_streaming(file_path)
+
+    def chords_streaming_jsonl(self, file_path):
+        """Generator of JSONL blocks for a whole file, as segments become final. Raises on errors."""
+        from .chords import iter_chords_jsonl
+        with self.stats.measure("chords_streaming"):
+            yield from iter_chords_jsonl(file_path)
+
+    # --- Auto-listen loop ---
+
+    async def listen(self):
+        """
+        Capture system audio and identify songs as the scheduler asks for it.
+        Yields (event, data):
+            ("identifying", reason), ("song", track), ("same_song", track),
+            ("no_match", None), ("capture_failed", None)
+        Runs until stop() is called; use contextlib.aclosing to break out early.
+        Each call owns its monitor and stop flag, so a listen() started right
+        after stop() never shares a capture thread with the one still winding down.
+        """
+        monitor = LoopbackMonitor(self.capture_path, rate=self.rate, capture_seconds=self.record_seconds)
+        stopped = threading.Event()
+        self.monitor, self._stop_listening = monitor, stopped
+        monitor.start(asyncio.get_running_loop())
+        last_key = None
+        try:
+            while not stopped.is_set():
+                try:
+                    reason, file_path = await asyncio.wait_for(monitor.next_capture(), timeout=1)
+                except asyncio.TimeoutError:
+                    continue
+
+                if not file_path:
+                    yield "capture_failed", None
+                    break
+
+                self.stats.calls["capture"] += 1
+                yield "identifying", reason
+
+                track = None
+                try:
+                    track = await self.identify(file_path)
+                except Exception as e:
+                    log.warning("Shazam Error: %s", e)
+
+                if stopped.is_set():
+                    break # Stopped while Shazam was busy: don't start a tab search for it
+
+                key = track.get('key') if track else None
+                monitor.mark_recognized(key)
+
+                if key is None:
+                    yield "no_match", None
+                elif key != last_key:
+                    last_key = key
+                    yield "song", track
+                else:
+                    yield "same_song", track
+        finally:
+            monitor.stop()
+            monitor.remove_captures()
+            stopped.set()
+
+    def stop(self):
+        """Ends the running listen() (it exits at its next capture or poll)."""
+        if self._stop_listening is not None:
+            self._stop_listening.set()
+            # Stop recording now rather than when the generator next wakes up
+            self.monitor.stop()
+
+    def capture_stats(self):
+        return self.monitor.stats() if self.monitor else {}
+
+    def executor_metrics(self):
+        return self.executors.metrics()
+
+    def close(self):
+        self.executors.shutdown()
@@ -0,0 +1,166 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+
+# --- Executors: I/O threads for HTTP, warm workers for DSP ---
+# A slow scrape must never sit in front of chord analysis, and CPU-bound
+# chroma work should use every core instead of fighting the UI loop for the
+# GIL. Sizes come from the constructor or CHORD_IO_WORKERS / CHORD_DSP_WORKERS
+# / CHORD_DSP_MODE ("process" or "thread").
+
+def _timed_call(fn, args, kwargs):
+    # Runs in the worker (thread or process): wall-clock timestamps work across both
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return result, started, time.time() - started
+
+def _warm_dsp_worker():
+    # Import librosa and run a tiny chroma once so numba JIT and filter caches
+    # are ready before the first real clip arrives
+    import numpy as np
+    from .preprocess import librosa
+    y = np.random.default_rng(0).standard_normal(2 * 22050).astype(np.float32)
+    librosa.feature.chroma_cens(y=y, sr=22050, hop_length=512, fmin=librosa.note_to_hz('C2'))
+
+def _noop():
+    return os.getpid()
+
+def _resolve(setter, value):
+    # The outer future may have been cancelled from the event loop thread meanwhile
+    try:
+        setter(value)
+    except concurrent.futures.InvalidStateError:
+        pass
+
+class InstrumentedExecutor(concurrent.futures.Executor):
+    """
+    Wraps a thread or process pool and tracks queue depth, wait time and busy
+    time. Can be passed to loop.run_in_executor like any executor.
+    """
+    def __init__(self, name, pool, workers):
+        self.name = name
+        self.pool = pool
+        self.workers = workers
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.max_queue_depth = 0
+        self.created = time.time()
+
+    def submit(self, fn, /, *args, **kwargs):
+        submitted_at = time.time()
+        # Raises (e.g. RuntimeError after shutdown) before anything is counted
+        inner = self.pool.submit(_timed_call, fn, args, kwargs)
+        with self._lock:
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue_depth())
+        outer = concurrent.futures.Future()
+
+        def _done(future):
+            if future.cancelled():
+                # Dropped while still queued: never ran, so neither failed nor busy
+                with self._lock:
+                    self.completed += 1
+                    self.cancelled += 1
+                outer.cancel()
+                return
+
+            try:
+                result, started, elapsed = future.result()
+            except BaseException as e:
+                with self._lock:
+                    self.completed += 1
+                    self.failed += 1
+                _resolve(outer.set_exception, e)
+                return
+
+            with self._lock:
+                self.completed += 1
+                self.busy_seconds += elapsed
+                self.wait_seconds += max(0.0, started - submitted_at)
+            _resolve(outer.set_result, result)
+
+        inner.add_done_callback(_done)
+        # Cancelling the returned future (e.g. asyncio task cancelled) drops queued work
+        outer.add_done_callback(lambda f: f.cancelled() and inner.cancel())
+        return outer
+
+    async def run(self, fn, *args):
+        """Await fn(*args) on this pool."""
+        return await asyncio.get_running_loop().run_in_executor(self, fn, *args)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _queue_depth(self):
+        return max(0, self.submitted - self.completed - self.workers)
+
+    def metrics(self):
+        with self._lock:
+            elapsed = max(time.time() - self.created, 1e-9)
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "in_flight": self.submitted - self.completed,
+                "queue_depth": self._queue_depth(),
+                "max_queue_depth": self.max_queue_depth,
+                "busy_seconds": round(self.busy_seconds, 3),
+                "avg_wait_ms": round(1000 * self.wait_seconds / max(self.completed - self.failed - self.cancelled, 1), 1),
+                "utilization": round(self.busy_seconds / (elapsed * self.workers), 3),
+            }
+
+class Executors:
+    """The engine's two pools: `io` (HTTP scraping) and `dsp` (chroma / decoding)."""
+    def __init__(self, io_workers=None, dsp_workers=None, dsp_mode=None, warm=True):
+        self.io_workers = io_workers or int(os.environ.get("CHORD_IO_WORKERS", 4))
+        self.dsp_workers = dsp_workers or int(os.environ.get("CHORD_DSP_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+        self.dsp_mode = dsp_mode or os.environ.get("CHORD_DSP_MODE", "process")
+        self.warm = warm
+        self._io = None
+        self._dsp = None
+        self._lock = threading.Lock()
+
+    @property
+    def io(self):
+        with self._lock:
+            if self._io is None:
+                pool = concurrent.futures.ThreadPoolExecutor(self.io_workers, thread_name_prefix="chord-io")
+                self._io = InstrumentedExecutor("io", pool, self.io_workers)
+            return self._io
+
+    @property
+    def dsp(self):
+        # Created on first use: front ends that never analyse chords don't pay for the workers
+        with self._lock:
+            if self._dsp is None:
+                initializer = _warm_dsp_worker if self.warm else None
+                if self.dsp_mode == "thread":
+                    # numpy/librosa release the GIL in their inner loops
+                    pool = concurrent.futures.ThreadPoolExecutor(
+                        self.dsp_workers, thread_name_prefix="chord-dsp", initializer=initializer)
+                else:
+                    pool = concurrent.futures.ProcessPoolExecutor(self.dsp_workers, initializer=initializer)
+                self._dsp = InstrumentedExecutor("dsp", pool, self.dsp_workers)
+            return self._dsp
+
+    def warm_up(self):
+        """Start (and warm) every DSP worker now instead of on the first clip."""
+        for future in [self.dsp.pool.submit(_noop) for _ in range(self.dsp_workers)]:
+            future.result()
+
+    def metrics(self):
+        return {name: pool.metrics() for name, pool in (("io", self._io), ("dsp", self._dsp)) if pool is not None}
+
+    def shutdown(self, wait=True):
+        for pool in (self._io, self._dsp):
+            if pool is not None:
+                pool.shutdown(wait=wait)
@@ -0,0 +1,171 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# --- Persistent Chroma Feature Store ---
+# Chroma is saved as float16 .npy (memory-mappable) next to a small .json with
+# the frame timing and feature config. Entries are keyed by file content hash
+# + feature config, so re-decoding with other Viterbi settings skips the DSP.
+
+DEFAULT_ROOT = os.environ.get(
+    "CHORD_FEATURE_STORE",
+    os.path.join(os.path.expanduser("~"), ".cache", "chordlistener", "features"),
+)
+
+def file_hash(file_path, chunk_size=1 << 20):
+    """SHA-1 of the file contents, read in chunks (the path alone is not enough: temp_live.wav is reused)."""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class FeatureStore:
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def key(self, file_path, config):
+        """
+        Entry key for a file analysed with a given feature config.
+        Returns:
+            key (str): Hex digest of content hash + sorted config.
+            content_hash (str): Hash of the audio file alone.
+        """
+        content_hash = file_hash(file_path)
+        blob = json.dumps({"file": content_hash, "config": config}, sort_keys=True)
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest(), content_hash
+
+    def _paths(self, key):
+        base = os.path.join(self.root, key)
+        return base + ".npy", base + ".json"
+
+    def load(self, key):
+        """Return (chroma memmap, metadata) or (None, None) on a miss."""
+        npy_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            chroma = np.load(npy_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None, None
+
+        # Touch for LRU eviction (best effort: the store may be read-only)
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return chroma, meta
+
+    def _publish(self, write, final_path, suffix):
+        # Every writer gets its own temp file; the same key may be saved concurrently
+        # (duplicate inputs on the DSP pool, two recognizer.py --cache runs)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=os.path.basename(final_path) + ".", suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, final_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            # Lost the race (e.g. Windows refuses to replace a file a reader has open):
+            # the other writer stored the same content
+            if not os.path.exists(final_path):
+                raise
+
+    def save(self, key, chroma, meta):
+        """Store chroma as float16; writes go through a temp file so readers never see half an entry."""
+        npy_path, meta_path = self._paths(key)
+        meta = dict(meta, n_frames=int(chroma.shape[1]), dtype="float16", created=time.time())
+
+        self._publish(lambda f: np.save(f, np.asarray(chroma, dtype=np.float16)), npy_path, ".tmp.npy")
+        self._publish(lambda f: f.write(json.dumps(meta).encode("utf-8")), meta_path, ".tmp")
+
+    def entries(self):
+        """Metadata of every entry, least recently used first."""
+        result = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            npy_path, meta_path = self._paths(key)
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                meta["key"] = key
+                meta["bytes"] = os.path.getsize(npy_path) + os.path.getsize(meta_path)
+                meta["last_used"] = os.path.getmtime(meta_path)
+            except (OSError, ValueError):
+                continue
+            result.append(meta)
+        return sorted(result, key=lambda m: m["last_used"])
+
+    def size(self):
+        """Total bytes on disk."""
+        return sum(m["bytes"] for m in self.entries())
+
+    def evict(self, keys):
+        """Delete the given entries. Returns the number of bytes freed."""
+        freed = 0
+        for key in keys:
+            for path in self._paths(key):
+                try:
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                except OSError:
+                    pass
+        return freed
+
+    def evict_to_size(self, max_bytes):
+        """Evict least recently used entries until the store fits in max_bytes."""
+        entries = self.entries()
+        total = sum(m["bytes"] for m in entries)
+        victims = []
+        for meta in entries:
+            if total <= max_bytes:
+                break
+            victims.append(meta["key"])
+            total -= meta["bytes"]
+        return self.evict(victims)
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and prune the chroma feature store.")
+    parser.add_argument("--root", default=DEFAULT_ROOT)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List entries (least recently used first)")
+    sub.add_parser("size", help="Report total store size")
+    evict = sub.add_parser("evict", help="Remove entries")
+    evict.add_argument("keys", nargs="*", help="Entry keys to remove")
+    evict.add_argument("--all", action="store_true", help="Remove every entry")
+    evict.add_argument("--max-mb", type=float, help="Remove LRU entries until the store fits")
+    args = parser.parse_args()
+
+    store = FeatureStore(args.root)
+
+    if args.command == "list":
+        for meta in store.entries():
+            seconds = meta["n_frames"] * meta["hop_length"] / meta["sr"]
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(meta["last_used"]))
+            print(f"{meta['key']}  {meta['bytes'] / 1024:8.1f} KB  {seconds:7.1f}s  {used}  {meta.get('source', '')}")
+    elif args.command == "size":
+        entries = store.entries()
+        print(f"{len(entries)} entries, {sum(m['bytes'] for m in entries) / 2**20:.2f} MB in {store.root}")
+    elif args.command == "evict":
+        if args.all:
+            freed = store.evict([m["key"] for m in store.entries()])
+        elif args.max_mb is not None:
+            freed = store.evict_to_size(int(args.max_mb * 2**20))
+        elif args.keys:
+            freed = store.evict(args.keys)
+        else:
+            parser.error("evict needs keys, --all or --max-mb")
+        print(f"Freed {freed / 2**20:.2f} MB")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+try:
+    from shazamio import Shazam
+    RECOGNITION_AVAILABLE = True
+except ImportError:
+    RECOGNITION_AVAILABLE = False
+
+# --- Identify: audio clip -> track ---
+
+class Identifier:
+    """One Shazam client reused for every clip."""
+    def __init__(self):
+        self.shazam = Shazam() if RECOGNITION_AVAILABLE else None
+
+    async def recognize(self, file_path):
+        """Returns the Shazam track dict, or None when nothing matched."""
+        out = await self.shazam.recognize(file_path)
+        return out.get('track') or None
+
+def full_name(track):
+    return f"{track.get('subtitle')} - {track.get('title')}"
@@ -0,0 +1,83 @@
+import os
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+# --- Preprocess: audio -> chroma ---
+
+# Everything that changes the chroma values; part of the feature store key
+CHROMA_CONFIG = {"feature": "chroma_cens", "hpss": True, "sr": 22050, "hop_length": 512, "fmin": "C2", "duration": 30}
+
+def compute_chroma(file_path):
+    # Load audio (downsample to 22050 for speed)
+    y, sr = librosa.load(file_path, sr=22050, duration=30)
+    
+    # Use Harmonic component
+    y_harmonic, _ = librosa.effects.hpss(y)
+    
+    # Compute Chroma CENS (Chroma Energy Normalized Statistics)
+    # CENS is robust to dynamics and timbre, good for chord ID
+    # hop_length=512 gives ~43 frames/sec
+    return librosa.feature.chroma_cens(y=y_harmonic, sr=sr, hop_length=512, fmin=librosa.note_to_hz('C2'))
+
+def load_or_compute_chroma(file_path, store=None):
+    """Chroma for a file, served from the feature store when possible (skips load + HPSS + CENS)."""
+    if store is None:
+        return compute_chroma(file_path)
+    
+    key, content_hash = store.key(file_path, CHROMA_CONFIG)
+    chroma, _ = store.load(key)
+    if chroma is not None:
+        return np.asarray(chroma, dtype=np.float32)
+    
+    chroma = compute_chroma(file_path)
+    store.save(key, chroma, {
+        "source": os.path.abspath(file_path),
+        "file_hash": content_hash,
+        "config": CHROMA_CONFIG,
+        # Frame i starts at i * hop_length / sr seconds
+        "sr": CHROMA_CONFIG["sr"],
+        "hop_length": CHROMA_CONFIG["hop_length"],
+    })
+    # Return what a hit would: the stored (float16) precision, so results never depend on cache state
+    return chroma.astype(np.float16).astype(np.float32)
+
+# --- Streaming analysis for long files (bounded memory) ---
+
+def stream_chroma(file_path, sr=22050, hop_length=512, block_seconds=30, context_seconds=2.0):
+    """
+    Yield chroma CENS block by block without loading the whole file.
+    Each block is read with `context_seconds` of extra audio on both sides so the
+    HPSS median filters and CENS smoothing see the same neighbourhood as a
+    full-file pass. The context frames are trimmed, so consecutive yields are
+    contiguous and non-overlapping, frame-aligned with a full-file analysis.
+    """
+    block = int(block_seconds * sr) // hop_length * hop_length
+    context = int(context_seconds * sr) // hop_length * hop_length
+    
+    with sf.SoundFile(file_path) as f:
+        ratio = f.samplerate / sr
+        n_samples = int(round(f.frames / ratio)) # Length at the target rate
+        n_frames = 1 + n_samples // hop_length # Same count as librosa with center=True
+        
+        for first in range(0, n_frames, block // hop_length):
+            last = min(first + block // hop_length, n_frames)
+            start = first * hop_length
+            seg_start = max(0, start - context)
+            seg_end = min(n_samples, start + block + context)
+            
+            # Read only this segment (native rate), then downmix + resample
+            native_start = int(seg_start * ratio)
+            f.seek(native_start)
+            y = f.read(int(seg_end * ratio) - native_start, dtype='float32', always_2d=True)
+            y = y.mean(axis=1)
+            if f.samplerate != sr:
+                y = librosa.resample(y, orig_sr=f.samplerate, target_sr=sr)
+            y = librosa.util.fix_length(y, size=seg_end - seg_start)
+            
+            y_harmonic, _ = librosa.effects.hpss(y)
+            chroma = librosa.feature.chroma_cens(y=y_harmonic, sr=sr, hop_length=hop_length, fmin=librosa.note_to_hz('C2'))
+            
+            offset = (start - seg_start) // hop_length
+            yield chroma[:, offset:offset + (last - first)]
@@ -0,0 +1,98 @@
+import concurrent.futures
+import logging
+import threading
+
+import requests
+from bs4 import BeautifulSoup
+
+log = logging.getLogger(__name__)
+
+# --- Tabs: "Artist - Song" -> Cifra Club page ---
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+class CifraClubScraper:
+    """
+    Google -> Cifra Club scraper. Results are cached per query. Safe to call
+    from several threads: each thread keeps its own requests.Session (kept
+    alive across lookups), and a query already being scraped by another
+    thread is waited for instead of scraped twice.
+    """
+    def __init__(self, timeout=10, cache_size=128):
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._cache = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        # requests.Session isn't documented as thread-safe: one per thread
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(HEADERS)
+        return session
+
+    def search(self, query):
+        """Returns {"url", "content"} or None. Blocking: run it off the event loop."""
+        with self._lock:
+            if query in self._cache:
+                return self._cache[query]
+            future = self._in_flight.get(query)
+            owner = future is None
+            if owner:
+                future = self._in_flight[query] = concurrent.futures.Future()
+
+        if not owner:
+            return future.result()
+
+        result = None
+        try:
+            result = self._search(query)
+            with self._lock:
+                if result is not None:
+                    if len(self._cache) >= self.cache_size:
+                        self._cache.pop(next(iter(self._cache)))
+                    self._cache[query] = result
+        finally:
+            with self._lock:
+                del self._in_flight[query]
+            future.set_result(result)
+        return result
+
+    def _search(self, query):
+        log.info("Searching for: %s", query)
+        search_url = f"https://www.google.com/search?q={query} cifra club"
+
+        try:
+            resp = self.session.get(search_url, timeout=self.timeout)
+            soup = BeautifulSoup(resp.text, 'html.parser')
+
+            link = None
+            for a in soup.find_all('a', href=True):
+                if 'cifraclub.com.br' in a['href']:
+                    link = a['href']
+                    if '/url?q=' in link:
+                        link = link.split('/url?q=')[1].split('&')[0]
+                    break
+
+            if not link:
+                return None
+
+            log.info("Found link: %s", link)
+            cifra_resp = self.session.get(link, timeout=self.timeout)
+            cifra_soup = BeautifulSoup(cifra_resp.text, 'html.parser')
+
+            pre_content = cifra_soup.find('pre')
+            if pre_content:
+                return {
+                    "url": link,
+                    "content": pre_content.get_text()
+                }
+        except Exception as e:
+            log.warning("Error scraping: %s", e)
+        return None
@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import os
 import shutil
 from rich.console import Console
@@ -9,24 +10,11 @@ from rich.text import Text
 from rich.spinner import Spinner
 from rich.align import Align
 from rich.syntax import Syntax
-import requests
-from bs4 import BeautifulSoup
 
 # Check dependencies
 console = Console()
 
-try:
-    import soundcard as sc
-    import soundfile as sf
-    AUDIO_AVAILABLE = True
-except ImportError:
-    AUDIO_AVAILABLE = False
-
-try:
-    from shazamio import Shazam
-    RECOGNITION_AVAILABLE = True
-except ImportError:
-    RECOGNITION_AVAILABLE = False
+from chordlistener import AUDIO_AVAILABLE, RECOGNITION_AVAILABLE, ChordEngine, full_name
 
 # Configuration
 RATE = 44100
@@ -36,60 +24,6 @@ WAVE_OUTPUT_FILENAME = "captured_sample_cli.wav"
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
-async def record_audio_segment():
-    """Records system loopback audio."""
-    if not AUDIO_AVAILABLE:
-        return None
-    try:
-        loop = asyncio.get_event_loop()
-        def _record():
-            mic = sc.default_speaker()
-            # Record 5 seconds
-            data = mic.record(samplerate=RATE, numframes=RATE * RECORD_SECONDS)
-            sf.write(WAVE_OUTPUT_FILENAME, data, RATE)
-            return WAVE_OUTPUT_FILENAME
-        
-        return await loop.run_in_executor(None, _record)
-    except Exception as e:
-        # console.log(f"[red]Audio Error:[/red] {e}")
-        return None
-
-def search_cifra_club_sync(artist, title):
-    """Searches and scrapes Cifra Club."""
-    query = f"{artist} {title} cifra club"
-    search_url = f"https://www.google.com/search?q={query}"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    
-    try:
-        resp = requests.get(search_url, headers=headers, timeout=10)
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        
-        link = None
-        for a in soup.find_all('a', href=True):
-            if 'cifraclub.com.br' in a['href']:
-                link = a['href']
-                if '/url?q=' in link:
-                    link = link.split('/url?q=')[1].split('&')[0]
-                break
-        
-        if not link:
-            return None
-        
-        cifra_resp = requests.get(link, headers=headers, timeout=10)
-        cifra_soup = BeautifulSoup(cifra_resp.text, 'html.parser')
-        
-        pre_content = cifra_soup.find('pre')
-        if pre_content:
-            return {
-                "url": link,
-                "content": pre_content.get_text()
-            }
-    except Exception:
-        pass
-    return None
-
 async def main():
     clear_screen()
     
@@ -107,8 +41,7 @@ async def main():
         console.print("[bold red]Error:[/bold red] 'soundcard'/'soundfile' not installed. Cannot hear PC.")
         return
 
-    shazam = Shazam()
-    last_song_key = None
+    engine = ChordEngine(WAVE_OUTPUT_FILENAME, rate=RATE, record_seconds=RECORD_SECONDS)
     
     # Status Layout
     status_text = Text("Waiting for music...", style="yellow")
@@ -123,59 +56,54 @@ async def main():
     layout["content"].update(content_area)
 
     with Live(layout, refresh_per_second=4, screen=False) as live:
-        while True:
-            # 1. Update Status: Listening
-            status_text = Text("🎧  Listening...", style="green blink")
-            layout["status"].update(Panel(status_text, border_style="green"))
-            
-            # 2. Record
-            file_path = await record_audio_segment()
-            
-            if file_path:
-                status_text = Text("🔍  Identifying...", style="blue")
-                layout["status"].update(Panel(status_text, border_style="blue"))
+        # 1. Update Status: Listening
+        status_text = Text("🎧  Listening...", style="green blink")
+        layout["status"].update(Panel(status_text, border_style="green"))
+        
+        # 2. Capture + recognize whenever the engine's scheduler asks for it
+        async with contextlib.aclosing(engine.listen()) as events:
+            async for event, data in events:
+                if event == "identifying":
+                    status_text = Text(f"🔍  Identifying ({data})...", style="blue")
+                    layout["status"].update(Panel(status_text, border_style="blue"))
                 
-                try:
-                    # 3. Recognize
-                    out = await shazam.recognize(file_path)
-                    track = out.get('track', {})
+                elif event == "capture_failed":
+                    status_text = Text("Audio capture failed.", style="bold red")
+                    layout["status"].update(Panel(status_text, border_style="red"))
+                    break
+                
+                elif event == "song":
+                    # 3. New song recognized
+                    name = full_name(data)
+                    status_text = Text(f"🎵  Found: {name}", style="bold magenta")
+                    layout["status"].update(Panel(status_text, border_style="magenta"))
+                    
+                    # 4. Search Cifra
+                    cifra_data = await engine.find_tabs(name)
                     
-                    if track:
-                        key = track.get('key')
-                        title = track.get('title')
-                        subtitle = track.get('subtitle')
-                        
-                        full_name = f"{subtitle} - {title}"
-                        
-                        if key != last_song_key:
-                            last_song_key = key
-                            
-                            status_text = Text(f"🎵  Found: {full_name}", style="bold magenta")
-                            layout["status"].update(Panel(status_text, border_style="magenta"))
-                            
-                            # 4. Search Cifra
-                            loop = asyncio.get_event_loop()
-                            cifra_data = await loop.run_in_executor(None, lambda: search_cifra_club_sync(subtitle, title))
-                            
-                            if cifra_data:
-                                tab_content = cifra_data['content']
-                                # Basic format highlighting
-                                syntax = Syntax(tab_content, "text", theme="monokai", word_wrap=True)
-                                content_area = Panel(syntax, title=f"{full_name} (Source: CifraClub)", border_style="green", expand=True)
-                            else:
-                                content_area = Panel(f"[red]Tab not found for {full_name}[/red]", title="Error", border_style="red")
-                            
-                            layout["content"].update(content_area)
-                        else:
-                            # Same song, just pulse status
-                            status_text = Text(f"🎵  Playing: {full_name}", style="magenta")
-                            layout["status"].update(Panel(status_text, border_style="magenta"))
-                            
-                except Exception as e:
-                    # console.print(f"Debug: {e}")
-                    pass
-            
-            await asyncio.sleep(1)
+                    if cifra_data:
+                        tab_content = cifra_data['content']
+                        # Basic format highlighting
+                        syntax = Syntax(tab_content, "text", theme="monokai", word_wrap=True)
+                        content_area = Panel(syntax, title=f"{name} (Source: CifraClub)", border_style="green", expand=True)
+                    else:
+                        content_area = Panel(f"[red]Tab not found for {name}[/red]", title="Error", border_style="red")
+                    
+                    layout["content"].update(content_area)
+                
+                elif event == "same_song":
+                    # Same song, just pulse status
+                    status_text = Text(f"🎵  Playing: {full_name(data)}", style="magenta")
+                    layout["status"].update(Panel(status_text, border_style="magenta"))
+                
+                else:
+                    status_text = Text("🎧  Listening...", style="green blink")
+                    layout["status"].update(Panel(status_text, border_style="green"))
+
+    console.print(f"[grey]Capture stats: {engine.capture_stats()}[/grey]")
+    console.print(f"[grey]Stage stats: {engine.stats.summary()}[/grey]")
+    console.print(f"[grey]Executor stats: {engine.executor_metrics()}[/grey]")
+    engine.close()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the package from the source tree, like benchmarks/ does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -0,0 +1,92 @@
+import numpy as np
+
+from chordlistener.capture import AdaptiveScheduler
+
+RATE = 8000
+BLOCK = 0.25
+
+
+def tone(seconds, freq=440.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return 0.3 * np.sin(2 * np.pi * freq * t)
+
+
+def noise(seconds, seed=0):
+    return 0.3 * np.random.default_rng(seed).standard_normal(int(seconds * RATE))
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * RATE))
+
+
+def run(scheduler, audio, song_key="song", respond=True):
+    """Feeds audio block by block; returns [(time, reason)] of due recognitions."""
+    n = int(RATE * BLOCK)
+    due = []
+    for start in range(0, audio.size - n + 1, n):
+        reason = scheduler.feed(audio[start:start + n])
+        if reason is not None:
+            due.append((scheduler.now, reason))
+            if respond:
+                scheduler.mark_recognized(song_key)
+    return due
+
+
+def make(**kw):
+    return AdaptiveScheduler(rate=RATE, block_seconds=BLOCK, **kw)
+
+
+def test_start_waits_for_settled_audio():
+    assert run(make(), tone(10))[0] == (3.0, "start")
+    # Leading silence counts as a gap: 3s of sound after it
+    assert run(make(), np.concatenate([silence(2), tone(10)]))[0] == (5.0, "silence_gap")
+
+
+def test_confirm_backs_off_while_song_unchanged():
+    due = run(make(base_interval=15, max_interval=60), tone(200))
+    times = [t for t, _ in due]
+    assert [r for _, r in due] == ["start"] + ["confirm"] * (len(due) - 1)
+    assert np.allclose(np.diff(times), [15, 30, 60, 60])
+
+
+def test_no_match_resets_interval():
+    scheduler = make(base_interval=15, max_interval=60)
+    due = run(scheduler, tone(50), song_key=None)
+    assert np.allclose(np.diff([t for t, _ in due]), 15)
+
+
+def test_silence_gap_triggers_once_sound_settles():
+    due = run(make(), np.concatenate([tone(20), silence(2), tone(10, freq=330)]))
+    gap = [t for t, r in due if r == "silence_gap"]
+    assert gap == [25.0] # Sound back at 22s, +3s settle
+
+
+def test_short_dropout_is_not_a_gap():
+    due = run(make(min_silence=0.75), np.concatenate([tone(20), silence(0.5), tone(10)]))
+    assert "silence_gap" not in [r for _, r in due]
+
+
+def test_novelty_fires_on_timbre_change_only():
+    steady = run(make(), tone(60))
+    assert "novelty" not in [r for _, r in steady]
+
+    due = run(make(), np.concatenate([tone(30), noise(15)]))
+    novelty = [t for t, r in due if r == "novelty"]
+    assert len(novelty) == 1
+    assert 30 < novelty[0] <= 30 + 3.0 + 2.0 # Change, settle, detection lag
+
+
+def test_refractory_limits_novelty_triggers():
+    audio = np.concatenate([tone(20), noise(6), tone(6, freq=220), noise(6, seed=1)])
+    due = run(make(refractory=30), audio)
+    assert [r for _, r in due].count("novelty") == 1
+
+
+def test_nothing_due_until_result_reported():
+    scheduler = make()
+    due = run(scheduler, np.concatenate([tone(20), silence(2), tone(20, freq=330)]), respond=False)
+    assert due == [(3.0, "start")]
+
+    # The gap seen meanwhile is still pending and fires on the next block
+    scheduler.mark_recognized("song")
+    assert scheduler.feed(tone(BLOCK)) == "silence_gap"
@@ -0,0 +1,62 @@
+import concurrent.futures
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from chordlistener.chords import estimate_chords, estimate_chords_batch, generate_templates, pad_chroma, viterbi_decoding, viterbi_decoding_batch
+
+
+def random_chroma(lengths, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.random((12, n)).astype(np.float32) for n in lengths]
+
+
+def test_batch_matches_per_clip_decoding_for_ragged_lengths():
+    templates, _ = generate_templates()
+    lengths = [120, 1, 37, 0, 200, 1, 64]
+    chromas = random_chroma(lengths)
+
+    stack, padded_lengths = pad_chroma(chromas)
+    paths = viterbi_decoding_batch(stack, padded_lengths, templates)
+
+    assert paths.shape == (len(lengths), max(lengths))
+    for chroma, path, length in zip(chromas, paths, lengths):
+        if length:
+            assert np.array_equal(path[:length], viterbi_decoding(chroma, templates))
+        assert (path[length:] == -1).all()
+
+
+def test_batch_of_empty_clips():
+    templates, _ = generate_templates()
+    stack, lengths = pad_chroma(random_chroma([0, 0]))
+    assert viterbi_decoding_batch(stack, lengths, templates).shape == (2, 0)
+
+
+@pytest.fixture(scope="module")
+def clips(tmp_path_factory):
+    """Short triad clips of different lengths, so sorting by length reorders them."""
+    rate = 22050
+    root = tmp_path_factory.mktemp("clips")
+    paths = []
+    for i, (seconds, freqs) in enumerate([(3, (261.63, 329.63, 392.00)), (1.5, (220.0, 261.63, 329.63)), (2, (392.00, 493.88, 587.33))]):
+        t = np.arange(int(seconds * rate)) / rate
+        path = str(root / f"clip_{i}.wav")
+        sf.write(path, 0.2 * sum(np.sin(2 * np.pi * f * t) for f in freqs), rate)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("use_executor", [False, True])
+def test_estimate_chords_batch_keeps_order_and_isolates_errors(clips, tmp_path, use_executor):
+    missing = str(tmp_path / "missing.wav")
+    file_paths = [clips[0], missing, clips[1], clips[2]]
+
+    if use_executor:
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            results = estimate_chords_batch(file_paths, executor=executor)
+    else:
+        results = estimate_chords_batch(file_paths)
+
+    assert results[1].startswith("Chord Error:")
+    assert [results[0], results[2], results[3]] == [estimate_chords(path) for path in clips]
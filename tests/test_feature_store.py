@@ -0,0 +1,146 @@
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from chordlistener import feature_store
+from chordlistener.chords import estimate_chords
+from chordlistener.feature_store import FeatureStore
+from chordlistener.preprocess import load_or_compute_chroma
+
+META = {"sr": 22050, "hop_length": 512, "source": "clip.wav"}
+
+
+def chroma(n_frames=100, seed=0):
+    return np.random.default_rng(seed).random((12, n_frames)).astype(np.float32)
+
+
+def fill(store, sizes):
+    """One entry per size (frames), last_used 1s apart in insertion order."""
+    for i, n_frames in enumerate(sizes):
+        key = f"key{i}"
+        store.save(key, chroma(n_frames, seed=i), META)
+        os.utime(store._paths(key)[1], (1000 + i, 1000 + i))
+
+
+def test_round_trip_is_float16(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    original = chroma()
+    store.save("k", original, META)
+
+    loaded, meta = store.load("k")
+    assert loaded.dtype == np.float16
+    assert np.array_equal(loaded, original.astype(np.float16))
+    assert np.abs(loaded - original).max() < 1e-3
+    assert meta["n_frames"] == 100 and meta["sr"] == 22050 and meta["source"] == "clip.wav"
+
+
+def test_miss_returns_none(tmp_path):
+    assert FeatureStore(str(tmp_path)).load("missing") == (None, None)
+
+
+def test_hit_decodes_like_miss(tmp_path):
+    rate = 22050
+    t = np.arange(4 * rate) / rate
+    y = sum(np.sin(2 * np.pi * f * t) for f in (261.63, 329.63, 392.00))
+    y[2 * rate:] = sum(np.sin(2 * np.pi * f * t[2 * rate:]) for f in (220.0, 261.63, 329.63))
+    path = str(tmp_path / "clip.wav")
+    sf.write(path, 0.2 * y, rate)
+
+    store = FeatureStore(str(tmp_path / "features"))
+    miss = load_or_compute_chroma(path, store)
+    hit = load_or_compute_chroma(path, store)
+    assert np.array_equal(miss, hit)
+    assert estimate_chords(path, store=store) == estimate_chords(path, store=store)
+
+
+def test_load_from_read_only_store(tmp_path, monkeypatch):
+    store = FeatureStore(str(tmp_path))
+    store.save("k", chroma(), META)
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(os, "utime", read_only)
+    assert store.load("k")[0] is not None
+
+
+def test_entries_are_least_recently_used_first(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    fill(store, [100, 100, 100])
+    assert [m["key"] for m in store.entries()] == ["key0", "key1", "key2"]
+
+    store.load("key0") # A hit moves the entry to the back
+    assert [m["key"] for m in store.entries()] == ["key1", "key2", "key0"]
+
+
+def test_evict(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    fill(store, [100, 100])
+    freed = store.evict(["key0", "unknown"])
+    assert freed > 0
+    assert [m["key"] for m in store.entries()] == ["key1"]
+    assert store.load("key0") == (None, None)
+
+
+def test_evict_to_size_drops_oldest(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    fill(store, [100, 100, 100])
+    sizes = [m["bytes"] for m in store.entries()]
+    store.evict_to_size(sum(sizes[1:]))
+    assert [m["key"] for m in store.entries()] == ["key1", "key2"]
+    store.evict_to_size(0)
+    assert store.entries() == []
+
+
+def test_concurrent_saves_of_one_key(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    errors = []
+
+    def save(seed):
+        try:
+            store.save("k", chroma(500, seed=seed), META)
+        except Exception as e:
+            errors.append(e)
+
+    for _ in range(10):
+        threads = [threading.Thread(target=save, args=(seed,)) for seed in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert sorted(os.listdir(tmp_path)) == ["k.json", "k.npy"] # No temp files left behind
+    assert store.load("k")[0].shape == (12, 500)
+
+
+def run_cli(monkeypatch, capsys, root, *args):
+    monkeypatch.setattr(sys, "argv", ["feature_store", "--root", root, *args])
+    feature_store.main()
+    return capsys.readouterr().out
+
+
+def test_cli(tmp_path, monkeypatch, capsys):
+    root = str(tmp_path)
+    fill(FeatureStore(root), [100, 100, 100])
+
+    listed = run_cli(monkeypatch, capsys, root, "list").splitlines()
+    assert [line.split()[0] for line in listed] == ["key0", "key1", "key2"]
+    assert "3 entries" in run_cli(monkeypatch, capsys, root, "size")
+
+    run_cli(monkeypatch, capsys, root, "evict", "key1")
+    assert [m["key"] for m in FeatureStore(root).entries()] == ["key0", "key2"]
+
+    run_cli(monkeypatch, capsys, root, "evict", "--max-mb", "0")
+    assert "0 entries" in run_cli(monkeypatch, capsys, root, "size")
+
+    fill(FeatureStore(root), [100])
+    assert run_cli(monkeypatch, capsys, root, "evict", "--all").startswith("Freed")
+    assert FeatureStore(root).entries() == []
+
+    with pytest.raises(SystemExit):
+        run_cli(monkeypatch, capsys, root, "evict")
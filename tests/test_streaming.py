@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from chordlistener.chords import WindowedViterbi, generate_templates, iter_chord_segments, segment_chords, viterbi_decoding
+from chordlistener.preprocess import compute_chroma, stream_chroma
+
+FPS = 22050 / 512
+ROOTS = [261.63, 293.66, 329.63, 349.23, 392.00, 440.00]
+
+
+def write_progression(path, rate, channels, seconds=25, chord_seconds=2.5, seed=0):
+    """Random major/minor triads; stereo files get a different mix per channel."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(rate * chord_seconds)) / rate
+    chords = []
+    for _ in range(int(seconds / chord_seconds)):
+        root = ROOTS[rng.integers(len(ROOTS))]
+        third = 4 if rng.random() < 0.5 else 3
+        chords.append(sum(np.sin(2 * np.pi * root * 2 ** (k / 12) * t) for k in (0, third, 7)))
+    y = 0.2 * np.concatenate(chords)
+    if channels == 2:
+        y = np.stack([y, 0.5 * y], axis=1)
+    sf.write(path, y, rate)
+
+
+@pytest.fixture(scope="module", params=[(44100, 1), (48000, 2)], ids=["44k-mono", "48k-stereo"])
+def clip(request, tmp_path_factory):
+    rate, channels = request.param
+    path = str(tmp_path_factory.mktemp("audio") / f"clip_{rate}_{channels}.wav")
+    write_progression(path, rate, channels)
+    return path, compute_chroma(path)
+
+
+def test_stream_chroma_matches_full_pass(clip):
+    path, full = clip
+    streamed = np.concatenate(list(stream_chroma(path, block_seconds=5)), axis=1)
+    assert streamed.shape == full.shape
+    assert np.abs(streamed - full).max() < 0.02
+
+
+def test_windowed_viterbi_matches_full_decode(clip):
+    path, full = clip
+    templates, _ = generate_templates()
+    decoder = WindowedViterbi(templates, lag=50)
+    committed = [decoder.push(chroma) for chroma in stream_chroma(path, block_seconds=5)]
+    committed.append(decoder.flush())
+    assert np.array_equal(np.concatenate(committed), viterbi_decoding(full, templates))
+
+
+def test_iter_chord_segments_matches_full_pipeline(clip):
+    path, full = clip
+    templates, _ = generate_templates()
+    expected = segment_chords(viterbi_decoding(full, templates), FPS)
+
+    chunks = list(iter_chord_segments(path, lag=50, block_seconds=5))
+    assert len(chunks) > 2 # Several chunks, so runs are carried across boundaries
+    for got, want in zip((np.concatenate(parts) for parts in zip(*chunks)), expected):
+        assert np.array_equal(got, want)